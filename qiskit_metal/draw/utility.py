@@ -19,26 +19,28 @@ but objects such as points and arrays used in drawing.
 """
 
 import math
-from collections.abc import Iterable, Mapping
+from collections.abc import Mapping
 from typing import List, Tuple, Union
 
 import numpy as np
 import shapely
 import shapely.wkt
-from numpy import array
 from numpy.linalg import norm
-from shapely.geometry import MultiPolygon, Polygon
+from shapely.geometry import Polygon
 
 from .. import logger
 from ..qlibrary.base import is_component
 from . import BaseGeometry
 
 __all__ = [
-    'get_poly_pts', 'get_all_component_bounds', 'get_all_geoms',
+    'get_poly_pts', 'get_all_component_bounds', 'get_all_geoms', 'iter_geoms',
     'flatten_all_filter', 'remove_colinear_pts', 'array_chop',
     'vec_unit_planar', 'Vector'
 ]
 
+# Machine epsilon, scaled by the `tol` arguments below
+_MACHINE_EPS = float(np.finfo(np.float64).eps)
+
 #########################################################################
 # Shapely Geometry Basic Coordinates
 
@@ -91,7 +93,7 @@ name if not (root_name == '') else name
 
     elif isinstance(obj, Mapping):
         return {
-            get_all_geoms(sub_obj, root_name=new_name(name))
+            name: get_all_geoms(sub_obj, func=func, root_name=new_name(name))
             for name, sub_obj in obj.items()
         }
         '''
@@ -117,6 +119,31 @@ name if not (root_name == '') else name
         return None
 
 
+def iter_geoms(obj, filter_obj=None):
+    """Iterate over all shapely objects in components, dict, etc.
+
+    Walks the same tree as :func:`get_all_geoms` but yields the geometries
+    directly, so no intermediate dict of dict needs to be built and flattened.
+
+    Arguments:
+        obj (dict, element, component): Object to get from.
+        filter_obj (class): Only yield instances of this class.  Defaults to None.
+
+    Yields:
+        BaseGeometry: Each shapely object found
+    """
+    if is_component(obj):
+        obj = obj.get_all_geom()
+
+    if isinstance(obj, BaseGeometry):
+        if filter_obj is None or isinstance(obj, filter_obj):
+            yield obj
+
+    elif isinstance(obj, Mapping):
+        for sub_obj in obj.values():
+            yield from iter_geoms(sub_obj, filter_obj=filter_obj)
+
+
 def flatten_all_filter(components: dict, filter_obj=None):
     """Internal function to flatten a dict of shapely objects.
 
@@ -130,17 +157,19 @@ def flatten_all_filter(components: dict, filter_obj=None):
     assert isinstance(components, dict)
 
     RES = []
-    for name, obj in components.items():
-        if isinstance(obj, dict):
-            RES += flatten_all_filter(obj, filter_obj)
-        else:
-            if filter_obj is None:
-                RES += [obj]  # add whatever we have in here
+    # Depth first with an explicit stack of dict iterators, keeping the order
+    stack = [iter(components.items())]
+    while stack:
+        for name, obj in stack[-1]:
+            if isinstance(obj, dict):
+                stack.append(iter(obj.items()))
+                break
+            if filter_obj is None or isinstance(obj, filter_obj):
+                RES.append(obj)
             else:
-                if isinstance(obj, filter_obj):
-                    RES += [obj]
-                else:
-                    print('flatten_all_filter: ', name)
+                print('flatten_all_filter: ', name)
+        else:
+            stack.pop()
 
     return RES
 
@@ -155,16 +184,31 @@ def get_all_component_bounds(components: dict, filter_obj=Polygon):
                               calcualte the bounds
 
     Returns:
-        tuple: (x_min, y_min, x_max, y_max)
+        tuple: (x_min, y_min, x_max, y_max) -- all nan if there is no
+        non-empty geometry to bound, as for an empty MultiPolygon
     """
     assert isinstance(components, dict)
 
-    components = get_all_geoms(components)
-    components = flatten_all_filter(components, filter_obj=filter_obj)
+    # Empty geometries have nan bounds, and MultiPolygon skips them too
+    components = [
+        geom for geom in iter_geoms(components, filter_obj=filter_obj)
+        if not geom.is_empty
+    ]
 
-    (x_min, y_min, x_max, y_max) = MultiPolygon(components).bounds
+    if not components:
+        return (math.nan, math.nan, math.nan, math.nan)
 
-    return (x_min, y_min, x_max, y_max)
+    if len(components) == 1:
+        return tuple(components[0].bounds)
+
+    # Reduce the bounds of each geometry, rather than build a MultiPolygon
+    bounds = np.fromiter((b for geom in components for b in geom.bounds),
+                         dtype=np.float64,
+                         count=4 * len(components)).reshape(-1, 4)
+    (x_min, y_min) = bounds[:, :2].min(axis=0)
+    (x_max, y_max) = bounds[:, 2:].max(axis=0)
+
+    return (float(x_min), float(y_min), float(x_max), float(y_max))
 
 
 def round_coordinate_sequence(geom_ref, precision):
@@ -198,13 +242,30 @@ def round_coordinate_sequence(geom_ref, precision):
 def check_duplicate_list(your_list):
     """Check if the list contains duplicates.
 
+    Arrays are not hashable, so for an array of points, or a list holding
+    arrays, rows are compared as tuples of their values, stopping at the
+    first duplicate found.
+
     Args:
         your_list (list): List to check
 
     Returns:
         bool: True if there are duplicates, False otherwise
     """
-    return len(your_list) != len(set(your_list))
+    if not isinstance(your_list, np.ndarray):
+        try:
+            return len(your_list) != len(set(your_list))
+        except TypeError:  # unhashable items, such as arrays
+            pass
+
+    seen = set()
+    for item in your_list:
+        if isinstance(item, np.ndarray):
+            item = tuple(item.tolist())
+        if item in seen:
+            return True
+        seen.add(item)
+    return False
 
 
 def array_chop(vec, zero=0, rtol=0, machine_tol=100):
@@ -221,42 +282,118 @@ def array_chop(vec, zero=0, rtol=0, machine_tol=100):
         array: Chopped arary
     '''
     vec = np.array(vec)
-    mask = np.isclose(vec,
-                      zero,
-                      rtol=rtol,
-                      atol=machine_tol * np.finfo(float).eps)
-    vec[mask] = 0
+    # Same test as np.isclose, without its generic broadcasting overhead
+    atol = machine_tol * _MACHINE_EPS + rtol * abs(zero)
+    offset = vec if zero == 0 else vec - zero
+    np.putmask(vec, np.abs(offset) <= atol, 0)
     return vec
 
 
-def remove_colinear_pts(points):
+def _remove_colinear_pts_kernel(points, atol):
+    """Single pass of remove_colinear_pts, compiled with numba when available.
+
+    Walks the points once and copies the kept ones to an output buffer,
+    with no intermediate arrays.
+    """
+    n = points.shape[0]
+    out = np.empty_like(points)
+    j = 0
+    for i in range(n):
+        if i > 0:
+            dx0 = points[i, 0] - points[i - 1, 0]
+            dy0 = points[i, 1] - points[i - 1, 1]
+            if dx0 == 0 and dy0 == 0:  # consequtive duplicate
+                continue
+            if i < n - 1:
+                dx1 = points[i + 1, 0] - points[i, 0]
+                dy1 = points[i + 1, 1] - points[i, 1]
+                cross = dx0 * dy1 - dy0 * dx1
+                dot = dx0 * dx1 + dy0 * dy1
+                if dot > 0 and abs(cross) <= atol * math.hypot(
+                        dx0, dy0) * math.hypot(dx1, dy1):
+                    continue
+                if math.hypot(dx0 - dx1, dy0 - dy1) < atol:
+                    continue
+        out[j, :] = points[i, :]
+        j += 1
+    return out[:j].copy()
+
+
+# Above this many points remove_colinear_pts uses the numba kernel, if installed
+_NUMBA_MIN_POINTS = 1000
+
+# Compiled kernel; None until first needed, False if numba is not installed
+_remove_colinear_pts_numba = None
+
+
+def _get_remove_colinear_pts_numba():
+    """Import numba and compile the kernel on first use.
+
+    Returns:
+        function: Compiled kernel, or None if numba is not installed
+    """
+    global _remove_colinear_pts_numba
+    if _remove_colinear_pts_numba is None:
+        try:  # Optional, only imported when a large polygon needs it
+            import numba
+        except ImportError:
+            _remove_colinear_pts_numba = False
+        else:
+            _remove_colinear_pts_numba = numba.njit(
+                cache=True)(_remove_colinear_pts_kernel)
+    return _remove_colinear_pts_numba or None
+
+
+def remove_colinear_pts(points, tol: int = 100):
     '''
     Remove colinear points and identical consequtive points.
 
+    A point is colinear when the segments before and after it are parallel
+    and point the same way, tested with the 2D cross product of the two
+    segments rather than their angle. Above a thousand points, uses a
+    compiled single-pass kernel when numba is installed.
+
     Args:
         points (array): Array of points
+        tol (int): How much to multiply the machine precision, np.finfo(float).eps,
+                   by as the tolerance.  Defaults to 100.
 
     Returns:
         ndarray: A copy of the input array without colinear points
     '''
-    remove_idx = []
-    for i in range(2, len(points)):
-        v1 = array(points[i - 2]) - array(points[i - 1])
-        v2 = array(points[i - 1]) - array(points[i - 0])
-        if Vector.are_same(v1, v2):
-            remove_idx += [i - 1]
-        elif Vector.angle_between(v1, v2) == 0:
-            remove_idx += [i - 1]
-    points = np.delete(points, remove_idx, axis=0)
-
+    points = np.asarray(points)
+    if len(points) < 2:
+        return points.copy()
+
+    if (len(points) > _NUMBA_MIN_POINTS and points.ndim == 2 and
+            points.dtype.kind in 'if'):
+        kernel = _get_remove_colinear_pts_numba()
+        if kernel is not None:
+            # Always float64, so the kernel is only compiled once
+            result = kernel(np.ascontiguousarray(points, dtype=np.float64),
+                            tol * _MACHINE_EPS)
+            return result.astype(points.dtype, copy=False)
+
+    # Segment vectors, with the x and y components kept as separate arrays
+    dx = np.diff(points[:, 0])
+    dy = np.diff(points[:, 1])
+    seg_len = np.hypot(dx, dy)
+    dx1, dy1, dx2, dy2 = dx[:-1], dy[:-1], dx[1:], dy[1:]
+
+    cross = dx1 * dy2 - dy1 * dx2
+    dot = dx1 * dx2 + dy1 * dy2
+    atol = tol * _MACHINE_EPS
+    colinear = (np.abs(cross) <= atol * seg_len[:-1] * seg_len[1:]) & (dot > 0)
+    same = np.hypot(dx1 - dx2, dy1 - dy2) < atol
+
+    # One mask for both removals, written in place, then a single copy
+    keep = np.ones(len(points), dtype=bool)
+    np.logical_or(colinear, same, out=colinear)
+    np.logical_not(colinear, out=keep[1:-1])
     # remove  consequtive duplicates
-    remove_idx = []
-    for i in range(1, len(points)):
-        if norm(points[i] - points[i - 1]) == 0:
-            remove_idx += [i]
-    points = np.delete(points, remove_idx, axis=0)
+    np.logical_and(keep[1:], seg_len != 0, out=keep[1:])
 
-    return points
+    return points[keep]
 
 
 #########################################################################
@@ -324,6 +461,10 @@ def vec_unit_planar(vector: np.array):
     Return a vector where is XY components now a unit vector.
     I.e., Normalizes only in the XY plane, leaves the Z plane alone.
 
+    A single vector is not chopped first, so a tiny but non-zero XY part,
+    e.g. [1e-20, 0], is normalized rather than treated as zero. Call
+    `array_chop` on the input beforehand to get the old behavior.
+
     Arguments:
         vector (np.array): Input 2D or 3D
 
@@ -333,6 +474,20 @@ def vec_unit_planar(vector: np.array):
     Raises:
         Exception: The input was not a 2 or 3 vector
     """
+    vector = np.asarray(vector, dtype=float)
+
+    if vector.ndim == 1 and len(vector) in (2, 3):
+        # Single 2D or 3D vector: scale x and y in a copy, leave z alone
+        _norm = math.hypot(vector[0], vector[1])
+
+        if not _norm:  # zero length vector
+            logger.debug(f'Warning: zero vector length')
+            return vector.copy()
+
+        vector = vector.copy()
+        vector[:2] /= _norm
+        return vector
+
     vector = array_chop(vector)  # get rid of near zero crap
 
     if len(vector) == 2:
@@ -431,16 +586,37 @@ class Vector:
         qy = sin_rad * x + cos_rad * y
         return np.array([qx, qy])  #ADD ARRAY CHOP - draw_utility
 
+    @staticmethod
+    def rotate_batch(xy: np.ndarray, radians: float,
+                     origin=(0, 0)) -> np.ndarray:
+        """Rotate an array of points around a given point with a single matrix product.
+        Positive angles are counter-clockwise and negative are clockwise rotations.
+
+        Arguments:
+            xy (np.ndarray): Nx2 array of points, or a single 2D point.
+            radians (float): Counter clockwise angle.
+            origin (tuple): point to rotate about.  Defaults to (0, 0).
+
+        Returns:
+            np.ndarray: rotated points, same shape as `xy`
+        """
+        xy = np.asarray(xy, dtype=float)
+        origin = np.asarray(origin, dtype=float)
+        cos_rad = math.cos(radians)
+        sin_rad = math.sin(radians)
+        rot = np.array([[cos_rad, -sin_rad], [sin_rad, cos_rad]])
+        return (xy - origin) @ rot.T + origin
+
     @staticmethod
     def angle(vector: Vec2D) -> float:
         """
         Return the angle in radians of a vector.
 
         Arguments:
-            vector (Union[list, np.ndarray): A 2D vector
+            vector (Union[list, np.ndarray): A 2D vector, or an Nx2 array of vectors
 
         Returns:
-            float: Angle in radians
+            float: Angle in radians (np.ndarray of angles for an Nx2 input)
 
         Caution:
             The angle is defined from the Y axis!
@@ -464,7 +640,11 @@ class Vector:
 
             Note that +0 and -0 are distinct floating point numbers, as are +inf and -inf.
         """
-        return np.arctan2(vector)
+        if np.ndim(vector) == 2:
+            vector = np.asarray(vector)
+            return np.arctan2(vector[..., 0], vector[..., 1])
+        x, y = vector
+        return math.atan2(x, y)
 
     @staticmethod
     def angle_between(v1: Vec2D, v2: Vec2D) -> float:
@@ -478,26 +658,31 @@ class Vector:
             float: Angle in radians. The angle of the ray intersecting the unit
             circle at the given x-coordinate in radians [0, pi]. This is a scalar.
         """
-        v1_u = vec_unit_planar(v1)
-        v2_u = vec_unit_planar(v2)
-        return np.arccos(np.clip(np.dot(v1_u, v2_u), -1.0, 1.0))
+        # atan2 of |cross| and dot needs no normalization, and unlike arccos
+        # stays accurate for nearly parallel vectors
+        cross = v1[0] * v2[1] - v1[1] * v2[0]
+        dot = v1[0] * v2[0] + v1[1] * v2[1]
+        return math.atan2(abs(cross), dot)
 
     @staticmethod
     def add_z(vec2D: np.array, z: float = 0.):
         """
         Turn a 2D vector into a 3D vector by adding the z coorindate.
+        An Nx2 array of vectors is turned into an Nx3 array.
 
         Arguments:
-            vec2D (np.array): Input 2D vector.
+            vec2D (np.array): Input 2D vector, or Nx2 array of vectors.
             z (float): Add this value to the 3rd dimension.  Defaults to {0}.
 
         Returns:
             np.array: 3D vector.
         """
-        if isinstance(vec2D[0], Iterable):
-            return array([Vector.add_z(vec, z=z) for vec in vec2D])
-        else:
-            return array(list(vec2D) + [z])
+        vec2D = np.asarray(vec2D)
+        vec3D = np.empty(vec2D.shape[:-1] + (3,),
+                         dtype=np.result_type(vec2D, z))
+        vec3D[..., :2] = vec2D
+        vec3D[..., 2] = z
+        return vec3D
 
     @staticmethod
     def normed(vec: Vec2D) -> Vec2D:
@@ -509,6 +694,9 @@ class Vector:
         Returns:
             vector: Vec2D -- Unit normed version of vector
         """
+        if np.ndim(vec) == 1 and len(vec) == 2:
+            x, y = vec
+            return np.array([x, y], dtype=float) / math.hypot(x, y)
         return vec / norm(vec)
 
     @staticmethod
@@ -523,6 +711,7 @@ class Vector:
         """
         return norm(vec)
 
+    @staticmethod
     def are_same(v1: Vec2D, v2: Vec2D, tol: int = 100) -> bool:
         """
         Check if two vectors are within an infentesmimal distance set
@@ -537,6 +726,9 @@ class Vector:
         Returns:
             bool: Same or not
         """
+        if (np.ndim(v1) == 1 and np.ndim(v2) == 1 and len(v1) == 2 and
+                len(v2) == 2):
+            return math.hypot(v1[0] - v2[0], v1[1] - v2[1]) < tol * _MACHINE_EPS
         v1, v2 = np.array(v1), np.array(v2)
         return Vector.is_zero(v1 - v2, tol=tol)
 
@@ -553,7 +745,9 @@ class Vector:
         Returns:
             bool: Close to zero or not
         """
-        return float(norm(vec)) < tol * np.finfo(float).eps
+        if np.ndim(vec) == 1 and len(vec) == 2:
+            return math.hypot(vec[0], vec[1]) < tol * _MACHINE_EPS
+        return float(norm(vec)) < tol * _MACHINE_EPS
 
     @staticmethod
     def get_distance(u: Union[tuple, list, np.ndarray],
@@ -601,8 +795,8 @@ class Vector:
         distance_vec = end - start  # distance vector
         # unit vector along the direction of the two point
         unit_vec = distance_vec / norm(distance_vec)
-        # tangent vector counter-clockwise 90 deg rotation
-        tangent_vec = np.round(Vector.rotate(unit_vec, np.pi / 2), decimals=11)
+        # tangent vector counter-clockwise 90 deg rotation, (x, y) -> (-y, x)
+        tangent_vec = np.array([-unit_vec[1], unit_vec[0]])
 
         if Vector.is_zero(distance_vec):
             logger.debug(
@@ -611,6 +805,34 @@ class Vector:
 
         return distance_vec, unit_vec, tangent_vec
 
+    @staticmethod
+    def two_points_described_soa(x0, y0, x1, y1) -> Tuple:
+        """
+        Get the distance, units and tagents, from separate x and y coordinates.
+
+        Same as `two_points_described`, but the start and end points are given
+        as x and y components, each a scalar or an array. Arrays broadcast, so
+        many pairs of points stored as contiguous coordinate arrays are
+        described in one call.
+
+        Arguments:
+            x0 (Union[float, np.ndarray]): x coordinate(s) of the start point
+            y0 (Union[float, np.ndarray]): y coordinate(s) of the start point
+            x1 (Union[float, np.ndarray]): x coordinate(s) of the end point
+            y1 (Union[float, np.ndarray]): y coordinate(s) of the end point
+
+        Returns:
+            tuple: (dx, dy, ux, uy, tx, ty) -- x and y components of the
+            distance, unit and tangent vectors
+        """
+        dx = np.subtract(x1, x0)
+        dy = np.subtract(y1, y0)
+        dist = np.hypot(dx, dy)
+        ux = dx / dist
+        uy = dy / dist
+        # tangent vector counter-clockwise 90 deg rotation, (x, y) -> (-y, x)
+        return dx, dy, ux, uy, -uy, ux
+
     @staticmethod
     def snap_unit_vector(vec_n: Vec2D, flip: bool = False) -> Vec2D:
         """snaps to either the x or y unit vectors.
@@ -622,10 +844,9 @@ class Vector:
         Returns:
             Vec2D: Snapped vector
         """
-        #TODO: done silly, fix up
-        m = np.argmax(abs(vec_n))
-        m = m if flip is False else int(not m)
-        v = np.array([0, 0])
+        m = 0 if abs(vec_n[0]) >= abs(vec_n[1]) else 1
+        if flip:
+            m = 1 - m
+        v = np.zeros(2)
         v[m] = np.sign(vec_n[m])
-        vec_n = v
-        return vec_n
+        return v
@@ -408,6 +408,69 @@ class TestDraw(unittest.TestCase, AssertionsMixin):
                                           expected[i][j],
                                           rel_tol=1e-3)
 
+    def test_draw_utility_get_all_geoms_nested(self):
+        """
+        Test get_all_geoms in utility.py with a nested dict.
+        """
+        poly_1 = Polygon([(0, 0), (0.5, 0), (0.25, 0.5)])
+        poly_2 = Polygon([(1, 1), (1.5, 1), (1.25, 1.5)])
+        my_dict = {'first': poly_1, 'nested': {'second': poly_2}}
+
+        actual = utility.get_all_geoms(my_dict)
+
+        self.assertEqual(actual, {
+            'first': poly_1,
+            'nested': {
+                'second': poly_2
+            }
+        })
+        self.assertIs(actual['first'], poly_1)
+        self.assertIs(actual['nested']['second'], poly_2)
+
+    def test_draw_utility_iter_geoms(self):
+        """
+        Test iter_geoms in utility.py.
+        """
+        poly_1 = Polygon([(0, 0), (0.5, 0), (0.25, 0.5)])
+        poly_2 = Polygon([(1, 1), (1.5, 1), (1.25, 1.5)])
+        line = LineString([(2, 2), (3, 3)])
+        my_dict = {'first': poly_1, 'nested': {'second': poly_2, 'line': line}}
+
+        actual = list(utility.iter_geoms(my_dict))
+        self.assertEqual(actual, [poly_1, poly_2, line])
+
+        actual = list(utility.iter_geoms(my_dict, filter_obj=Polygon))
+        self.assertEqual(actual, [poly_1, poly_2])
+
+    def test_draw_utility_get_all_component_bounds(self):
+        """
+        Test get_all_component_bounds in utility.py.
+        """
+        poly_1 = Polygon([(0, 0), (0.5, 0), (0.25, 0.5)])
+        poly_2 = Polygon([(1, 1), (1.5, 1), (1.25, 1.5)])
+        line = LineString([(2, 2), (3, 3)])
+        my_dict = {'first': poly_1, 'nested': {'second': poly_2, 'line': line}}
+
+        expected = (0.0, 0.0, 1.5, 1.5)
+        actual = utility.get_all_component_bounds(my_dict)
+
+        self.assertEqual(len(actual), len(expected))
+        for i in range(4):
+            self.assertAlmostEqualRel(actual[i], expected[i], rel_tol=1e-3)
+
+        # Empty polygons are skipped
+        my_dict['empty'] = Polygon()
+        actual = utility.get_all_component_bounds(my_dict)
+        for i in range(4):
+            self.assertIsInstance(actual[i], float)
+            self.assertAlmostEqualRel(actual[i], expected[i], rel_tol=1e-3)
+
+        # Nothing to bound
+        for empty in ({}, {'line': line}, {'empty': Polygon()}):
+            actual = utility.get_all_component_bounds(empty)
+            self.assertEqual(len(actual), 4)
+            self.assertTrue(np.isnan(actual).all())
+
     def test_draw_utility_flatten_all_filter(self):
         """
         Test flatten_all_filter in utility.py.
@@ -444,6 +507,20 @@ class TestDraw(unittest.TestCase, AssertionsMixin):
         self.assertEqual(utility.check_duplicate_list(list_1), False)
         self.assertEqual(utility.check_duplicate_list(list_2), True)
 
+        points_1 = np.array([[0., 0.], [1., 1.], [2., 2.]])
+        points_2 = np.array([[0., 0.], [1., 1.], [0., 0.]])
+
+        self.assertEqual(utility.check_duplicate_list(points_1), False)
+        self.assertEqual(utility.check_duplicate_list(points_2), True)
+
+        # Compared by value: -0. equals 0., across dtypes and tuples
+        points_3 = np.array([[0., 0.], [-0., 0.]])
+        self.assertEqual(utility.check_duplicate_list(points_3), True)
+        list_3 = [np.array([1, 2]), np.array([1., 2.])]
+        self.assertEqual(utility.check_duplicate_list(list_3), True)
+        self.assertEqual(
+            utility.check_duplicate_list([np.array([1., 2.]), (1, 2)]), True)
+
     def test_draw_utility_array_chop(self):
         """
         Test array_chop in utility.py.
@@ -486,6 +563,52 @@ class TestDraw(unittest.TestCase, AssertionsMixin):
                                           expected[i][j],
                                           rel_tol=1e-3)
 
+        # Colinear point with uneven spacing on either side
+        points = np.array([[0., 1.], [1., 2.], [3., 4.]])
+        actual = utility.remove_colinear_pts(points)
+        self.assertTrue(np.array_equal(actual, [[0., 1.], [3., 4.]]))
+
+        # Back-tracking point is not colinear, so it is kept
+        points = np.array([[0., 0.], [1., 0.], [0., 0.]])
+        actual = utility.remove_colinear_pts(points)
+        self.assertTrue(np.array_equal(actual, points))
+
+        # Nearly colinear point is only removed with a looser tolerance
+        points = np.array([[0., 0.], [1., 1e-10], [2., 0.]])
+        actual = utility.remove_colinear_pts(points)
+        self.assertTrue(np.array_equal(actual, points))
+        actual = utility.remove_colinear_pts(points, tol=1e7)
+        self.assertTrue(np.array_equal(actual, [[0., 0.], [2., 0.]]))
+
+    def test_draw_utility_remove_colinear_pts_kernel(self):
+        """
+        Test the single-pass kernel of remove_colinear_pts in utility.py,
+        run as plain Python, against the vectorized numpy path.
+        """
+        inputs = [
+            # duplicates
+            [[0., 0.], [1., 1.], [1., 1.], [1.5, 1.5], [2., 2.]],
+            [[0., 0.], [0., 0.], [0., 0.], [1., 0.]],
+            # back-tracking
+            [[0., 0.], [1., 0.], [0., 0.], [0., 1.]],
+            # colinear with uneven spacing
+            [[2., 0.], [-2., 1.], [-2., 1.], [0., -1.], [1., -2.], [2., -2.]],
+            [[0., 1.], [1., 2.], [3., 4.], [3., 5.]],
+            [[0., 0.], [1., 0.]],
+        ]
+        atol = 100 * utility._MACHINE_EPS
+
+        numba_kernel = utility._remove_colinear_pts_numba
+        utility._remove_colinear_pts_numba = False
+        try:
+            for points in inputs:
+                points = np.array(points)
+                expected = utility.remove_colinear_pts(points)
+                actual = utility._remove_colinear_pts_kernel(points, atol)
+                self.assertTrue(np.array_equal(actual, expected))
+        finally:
+            utility._remove_colinear_pts_numba = numba_kernel
+
     def test_draw_utility_intersect(self):
         """
         Test intersect in utility.py.
@@ -532,6 +655,28 @@ class TestDraw(unittest.TestCase, AssertionsMixin):
                                           expected[i][j],
                                           rel_tol=1e-3)
 
+        # single 2d vector
+        expected = [0.6, 0.8]
+        actual = utility.vec_unit_planar([3, 4])
+        self.assertEqual(len(actual), len(expected))
+        for i in range(2):
+            self.assertAlmostEqualRel(actual[i], expected[i], rel_tol=1e-3)
+
+        # single 3d vector, z is left alone
+        expected = [0.6, 0.8, 10.]
+        actual = utility.vec_unit_planar(np.array([3, 4, 10]))
+        self.assertEqual(len(actual), len(expected))
+        for i in range(3):
+            self.assertAlmostEqualRel(actual[i], expected[i], rel_tol=1e-3)
+
+        # zero length
+        actual = utility.vec_unit_planar([0, 0, 5])
+        self.assertTrue(np.array_equal(actual, [0., 0., 5.]))
+
+        # tiny vectors are not chopped to zero
+        actual = utility.vec_unit_planar([1e-20, 0])
+        self.assertTrue(np.array_equal(actual, [1., 0.]))
+
     def test_draw_vector_normal_z(self):
         """
         Test that normal_z in Vector class was not accidentally changed.
@@ -588,6 +733,44 @@ class TestDraw(unittest.TestCase, AssertionsMixin):
                                           expected[i][j],
                                           rel_tol=1e-3)
 
+    def test_draw_vector_rotate_batch(self):
+        """
+        Test rotate_batch in the Vector class in utility.py.
+        """
+        vector = Vector()
+
+        expected = [(1.5611824021515244, 6.655591972503418),
+                    (3.845748550112416, 4.988031624092862)]
+
+        actual = vector.rotate_batch([[1, 2], [3, 4]],
+                                     radians=30,
+                                     origin=(4, 4))
+
+        self.assertEqual(actual.shape, (2, 2))
+        for i in range(2):
+            for j in range(2):
+                self.assertAlmostEqualRel(actual[i][j],
+                                          expected[i][j],
+                                          rel_tol=1e-3)
+
+    def test_draw_vector_angle(self):
+        """
+        Test angle in Vector class in utility.py.
+        """
+        vector = Vector()
+
+        self.assertAlmostEqualRel(vector.angle([1, 1]),
+                                  0.7853981633974483,
+                                  rel_tol=1e-3)
+        self.assertAlmostEqualRel(vector.angle([1, 0]),
+                                  1.5707963267948966,
+                                  rel_tol=1e-3)
+
+        expected = [0.7853981633974483, 1.5707963267948966]
+        actual = vector.angle(np.array([[1, 1], [1, 0]]))
+        for i in range(2):
+            self.assertAlmostEqualRel(actual[i], expected[i], rel_tol=1e-3)
+
     def test_draw_vector_angle_between(self):
         """
         Test angle_between in Vector class in utility.py.
@@ -598,6 +781,11 @@ class TestDraw(unittest.TestCase, AssertionsMixin):
         actual = vector.angle_between([0, 10], [15, 20])
         self.assertAlmostEqualRel(actual, expected, rel_tol=1e-3)
 
+        # Nearly parallel vectors
+        expected = 1e-9
+        actual = vector.angle_between([1, 0], [1, 1e-9])
+        self.assertAlmostEqualRel(actual, expected, rel_tol=1e-3)
+
     def test_draw_vector_add_z(self):
         """
         Test add_z in Vector class in utility.py.
@@ -616,6 +804,15 @@ class TestDraw(unittest.TestCase, AssertionsMixin):
                                           expected[i][j],
                                           rel_tol=1e-3)
 
+        actual = vector.add_z(np.array([[10, 15], [22, 7]]), 2.5)
+        expected = [[10.0, 15.0, 2.5], [22.0, 7.0, 2.5]]
+        self.assertEqual(actual.shape, (2, 3))
+        for i in range(2):
+            for j in range(3):
+                self.assertAlmostEqualRel(actual[i][j],
+                                          expected[i][j],
+                                          rel_tol=1e-3)
+
     def test_draw_normed(self):
         """
         Test functionality of normed in utility.py.
@@ -626,6 +823,11 @@ class TestDraw(unittest.TestCase, AssertionsMixin):
         self.assertEqual(result[0], 0.6)
         self.assertEqual(result[1], 0.8)
 
+        # Zero vector gives nan, as numpy division does
+        with np.errstate(invalid='ignore'):
+            result = vector.normed([0, 0])
+        self.assertTrue(np.isnan(result).all())
+
     def test_draw_vector_norm(self):
         """
         Test norm in Vector class in utility.py.
@@ -650,6 +852,10 @@ class TestDraw(unittest.TestCase, AssertionsMixin):
 
         self.assertEqual(Vector.are_same(vect_1, vect_2), True)
         self.assertEqual(Vector.are_same(vect_1, vect_3), False)
+        self.assertEqual(Vector.are_same([1., 2.], (1., 2.)), True)
+        self.assertEqual(Vector.are_same([1., 2.], [1., 2.001]), False)
+        self.assertEqual(Vector.are_same(np.zeros((2, 3)), np.zeros((2, 3))),
+                         True)
 
     def test_draw_vector_is_zero(self):
         """
@@ -665,6 +871,10 @@ class TestDraw(unittest.TestCase, AssertionsMixin):
 
         self.assertEqual(vector.is_zero(vect_1), False)
         self.assertEqual(vector.is_zero(vect_2), True)
+        self.assertEqual(vector.is_zero([1e-20, 0.]), True)
+        self.assertEqual(vector.is_zero([0., 1e-3]), False)
+        self.assertEqual(vector.is_zero(np.zeros((2, 3))), True)
+        self.assertEqual(vector.is_zero(0.), True)
 
     def test_draw_vector_two_points_described(self):
         """
@@ -692,6 +902,29 @@ class TestDraw(unittest.TestCase, AssertionsMixin):
                                           expected[i][j],
                                           rel_tol=1e-3)
 
+    def test_draw_vector_two_points_described_soa(self):
+        """
+        Test two_points_described_soa in Vector class in utility.py.
+        """
+        vector = Vector()
+
+        expected = (-8.0, 15.0, -0.47058823529411764, 0.8823529411764706,
+                    -0.88235294118, -0.47058823529)
+
+        actual = vector.two_points_described_soa(10., 15., 2., 30.)
+        for i in range(6):
+            self.assertAlmostEqualRel(actual[i], expected[i], rel_tol=1e-3)
+
+        # Arrays of points
+        actual = vector.two_points_described_soa(np.array([10., 0.]),
+                                                 np.array([15., 0.]),
+                                                 np.array([2., 3.]),
+                                                 np.array([30., 4.]))
+        expected_2 = (3., 4., 0.6, 0.8, -0.8, 0.6)
+        for i in range(6):
+            self.assertAlmostEqualRel(actual[i][0], expected[i], rel_tol=1e-3)
+            self.assertAlmostEqualRel(actual[i][1], expected_2[i], rel_tol=1e-3)
+
     def test_draw_vector_snap_unit_vector(self):
         """
         Test snap_unit_vector in Vector class in utility.py.
@@ -706,6 +939,7 @@ class TestDraw(unittest.TestCase, AssertionsMixin):
         actual = []
         actual.append(vector.snap_unit_vector(vect))
         actual.append(vector.snap_unit_vector(vect, flip=True))
+        self.assertEqual(actual[0].dtype, float)
         actual = tuple(map(list, actual))
 
         for i in range(2):